@@ -0,0 +1,167 @@
+import os # Environment variables used to override the default limits
+import threading # Condition variables used to queue requests waiting for a free slot
+import time # Monotonic clock used for queue deadlines
+
+# -----------------------------
+# Cost Classification
+# -----------------------------
+
+# Requests estimated above this many milliseconds of CPU time are treated as expensive.
+EXPENSIVE_THRESHOLD_MS = 1.0
+
+CHEAP = "cheap"
+EXPENSIVE = "expensive"
+
+# Estimates the CPU cost (in milliseconds) of a single cryptographic operation.
+# The numbers are rough orders of magnitude, only good enough to separate sub-millisecond
+# AES work from RSA private-key operations and RSA key generation.
+def estimate_cost_ms(operation: str, algorithm: str, key_size: int = 0, payload_length: int = 0) -> float:
+    if algorithm == "AES":
+        # AES-GCM runs at roughly 1 GB/s, i.e. about 1 MB per millisecond, plus a fixed setup cost.
+        return 0.01 + payload_length / 1_000_000
+
+    if algorithm == "RSA":
+        scale = (key_size or 2048) / 2048
+        if operation == "generate-key":
+            # Prime search grows roughly with the fourth power of the modulus size.
+            return 60.0 * scale ** 4
+        if operation == "decrypt":
+            # Private-key operations grow roughly with the cube of the modulus size.
+            return 1.5 * scale ** 3
+        # Public-key operations use a small exponent and are cheap.
+        return 0.05 * scale ** 2
+
+    # Unknown algorithms are rejected later by validation, treat them as cheap here.
+    return 0.0
+
+# Maps a request to its cost class (CHEAP or EXPENSIVE).
+def classify_request(operation: str, algorithm: str, key_size: int = 0, payload_length: int = 0) -> str:
+    cost = estimate_cost_ms(operation, algorithm, key_size, payload_length)
+    return EXPENSIVE if cost > EXPENSIVE_THRESHOLD_MS else CHEAP
+
+# -----------------------------
+# Admission Control
+# -----------------------------
+
+# Raised when a request cannot be admitted (queue full or queue deadline exceeded).
+class AdmissionRejected(Exception):
+    def __init__(self, cost_class: str, reason: str, retry_after: float):
+        super().__init__(f"{cost_class} request rejected: {reason}")
+        self.cost_class = cost_class
+        self.reason = reason
+        self.retry_after = retry_after
+
+# Concurrency limit, bounded wait queue and counters for one cost class.
+class CostClass:
+    def __init__(self, name: str, max_concurrency: int, max_queue_depth: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self.queue_timeout = queue_timeout # Seconds a request may wait in the queue before it is shed
+
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._queued = 0
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_deadline = 0
+
+    # Waits for a free slot, or raises AdmissionRejected if the queue is full or the deadline passes.
+    def acquire(self):
+        with self._condition:
+            if self._in_flight < self.max_concurrency and self._queued == 0:
+                self._in_flight += 1
+                self._admitted += 1
+                return
+
+            # Shed immediately instead of growing the queue without bound.
+            if self._queued >= self.max_queue_depth:
+                self._rejected_queue_full += 1
+                raise AdmissionRejected(self.name, "queue full", self.queue_timeout)
+
+            deadline = time.monotonic() + self.queue_timeout
+            self._queued += 1
+            try:
+                while self._in_flight >= self.max_concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._rejected_deadline += 1
+                        raise AdmissionRejected(self.name, "queue deadline exceeded", self.queue_timeout)
+                    self._condition.wait(remaining)
+            finally:
+                self._queued -= 1
+
+            self._in_flight += 1
+            self._admitted += 1
+
+    # Frees a slot and wakes up one queued request.
+    def release(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    # Returns a snapshot of the limits and counters for this class.
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue_depth": self.max_queue_depth,
+                "queue_timeout": self.queue_timeout,
+                "in_flight": self._in_flight,
+                "queue_depth": self._queued,
+                "admitted": self._admitted,
+                "rejected_queue_full": self._rejected_queue_full,
+                "rejected_deadline": self._rejected_deadline,
+            }
+
+# Context manager returned by AdmissionController.admit(), holds one slot of a cost class.
+class _Slot:
+    def __init__(self, cost_class: CostClass):
+        self._cost_class = cost_class
+
+    def __enter__(self):
+        self._cost_class.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._cost_class.release()
+        return False
+
+# Keeps cheap and expensive requests in separate pools so that a burst of RSA work
+# can never occupy the slots that AES requests need.
+class AdmissionController:
+    def __init__(self, cheap: CostClass, expensive: CostClass):
+        self.classes = {CHEAP: cheap, EXPENSIVE: expensive}
+
+    # Usage: with controller.admit(classify_request(...)): ...
+    def admit(self, cost_class: str) -> _Slot:
+        return _Slot(self.classes[cost_class])
+
+    # Returns the stats of every cost class, keyed by class name.
+    def stats(self) -> dict:
+        return {name: cost_class.stats() for name, cost_class in self.classes.items()}
+
+# -----------------------------
+# Default Limits
+# -----------------------------
+
+# Each limit can be overridden with an environment variable, e.g. ADMISSION_EXPENSIVE_CONCURRENCY=4.
+#
+# A queued request still holds its server thread while it waits, so one class can occupy up to
+# max_concurrency + max_queue_depth threads. Keep EXPENSIVE_CONCURRENCY + EXPENSIVE_QUEUE_DEPTH
+# below the server's worker/thread count (e.g. gunicorn workers * threads), otherwise an RSA burst
+# can still take every worker and block AES requests.
+CHEAP_CONCURRENCY = int(os.environ.get("ADMISSION_CHEAP_CONCURRENCY", 32))
+CHEAP_QUEUE_DEPTH = int(os.environ.get("ADMISSION_CHEAP_QUEUE_DEPTH", 256))
+CHEAP_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_CHEAP_QUEUE_TIMEOUT", 0.5))
+EXPENSIVE_CONCURRENCY = int(os.environ.get("ADMISSION_EXPENSIVE_CONCURRENCY", 2))
+EXPENSIVE_QUEUE_DEPTH = int(os.environ.get("ADMISSION_EXPENSIVE_QUEUE_DEPTH", 4))
+EXPENSIVE_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_EXPENSIVE_QUEUE_TIMEOUT", 2.0))
+
+# Default controller: many cheap slots with a deep queue, few expensive slots with a shallow
+# queue, so expensive work is shed first when the server is overloaded.
+def create_default_controller() -> AdmissionController:
+    return AdmissionController(
+        cheap=CostClass(CHEAP, CHEAP_CONCURRENCY, CHEAP_QUEUE_DEPTH, CHEAP_QUEUE_TIMEOUT),
+        expensive=CostClass(EXPENSIVE, EXPENSIVE_CONCURRENCY, EXPENSIVE_QUEUE_DEPTH, EXPENSIVE_QUEUE_TIMEOUT),
+    )
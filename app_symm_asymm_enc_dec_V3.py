@@ -3,6 +3,8 @@ from pydantic import BaseModel, Field, ValidationError
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from cryptography.hazmat.primitives import hashes
+from admission_control import AdmissionRejected, classify_request, create_default_controller
+import math
 import os
 import base64
 
@@ -12,6 +14,9 @@ app = Flask(__name__)
 # Store generated keys seperately
 GENERATED_KEYS = {}
 
+# Separate concurrency limits and queues for cheap (AES) and expensive (RSA private-key, RSA key generation) work
+ADMISSION = create_default_controller()
+
 # DTOs for structured data validation
 class KeyGenerationRequest(BaseModel):
     key_type: str = Field(..., pattern="^(AES|RSA)$", description="Key type must be AES or RSA")
@@ -136,6 +141,13 @@ def decrypt_rsa(private_key, encrypted_data):
     except Exception as e:
         return f"RSA Decryption failed: {str(e)}"
 
+# Shed requests that could not be admitted with 503 Service Unavailable
+@app.errorhandler(AdmissionRejected)
+def admission_rejected(e):
+    response = jsonify({"error": str(e), "cost_class": e.cost_class})
+    response.headers["Retry-After"] = str(math.ceil(e.retry_after))
+    return response, 503
+
 # API endpoint: Generate Key for AES or RSA
 @app.route('/generate-key', methods=['POST'])
 def generate_key_api():
@@ -147,7 +159,9 @@ def generate_key_api():
         data = KeyGenerationRequest(**request.json)
     except ValidationError as e:
         return jsonify({"error": e.errors()}), 400
-    key_id, key_value = generate_key(data.key_type, data.key_size)
+    cost_class = classify_request("generate-key", data.key_type, data.key_size)
+    with ADMISSION.admit(cost_class):
+        key_id, key_value = generate_key(data.key_type, data.key_size)
     return jsonify({"key_id": key_id, "key_value": key_value})
 
 # API endpoint: Encryption
@@ -166,9 +180,13 @@ def encrypt():
     if data.algorithm != key_info["type"]:
         return jsonify({"error": "Algorithm mismatch"}), 400
     if data.algorithm == "AES":
-        ciphertext = encrypt_aes(key_info["key"], data.plaintext)
+        cost_class = classify_request("encrypt", "AES", len(key_info["key"]) * 8, len(data.plaintext))
+        with ADMISSION.admit(cost_class):
+            ciphertext = encrypt_aes(key_info["key"], data.plaintext)
     else:
-        ciphertext = encrypt_rsa(key_info["public_key"], data.plaintext)
+        cost_class = classify_request("encrypt", "RSA", key_info["public_key"].key_size, len(data.plaintext))
+        with ADMISSION.admit(cost_class):
+            ciphertext = encrypt_rsa(key_info["public_key"], data.plaintext)
     return jsonify({"ciphertext": ciphertext})
 
 # API endpoint: Decryption
@@ -187,11 +205,23 @@ def decrypt():
     if data.algorithm != key_info["type"]:
         return jsonify({"error": "Algorithm mismatch"}), 400
     if data.algorithm == "AES":
-        plaintext = decrypt_aes(key_info["key"], data.ciphertext)
+        cost_class = classify_request("decrypt", "AES", len(key_info["key"]) * 8, len(data.ciphertext))
+        with ADMISSION.admit(cost_class):
+            plaintext = decrypt_aes(key_info["key"], data.ciphertext)
     else:
-        plaintext = decrypt_rsa(key_info["private_key"], data.ciphertext)
+        cost_class = classify_request("decrypt", "RSA", key_info["private_key"].key_size, len(data.ciphertext))
+        with ADMISSION.admit(cost_class):
+            plaintext = decrypt_rsa(key_info["private_key"], data.ciphertext)
     return jsonify({"plaintext": plaintext})
 
+# API endpoint: Admission control stats (per-class queue depth and rejection counters)
+@app.route('/admission-stats', methods=['GET'])
+def admission_stats():
+    """
+    This function will report in-flight, queued, admitted and rejected requests per cost class
+    """
+    return jsonify(ADMISSION.stats())
+
 if __name__ == '__main__':
     # Start the Flask web server
     app.run(debug=True)
@@ -0,0 +1,128 @@
+import threading # Background threads used to hold slots and queue requests
+import time # Short sleeps to let queued threads reach the wait
+
+import pytest
+
+from admission_control import (
+    CHEAP,
+    EXPENSIVE,
+    AdmissionController,
+    AdmissionRejected,
+    CostClass,
+    classify_request,
+)
+
+# -----------------------------
+# Helpers
+# -----------------------------
+
+# Waits until the cost class reports the given queue depth (the queued thread reached the wait).
+def wait_for_queue_depth(cost_class: CostClass, depth: int, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while cost_class.stats()["queue_depth"] != depth:
+        assert time.monotonic() < deadline, "queued request never reached the wait"
+        time.sleep(0.005)
+
+# Starts a thread that calls acquire() and records either "admitted" or the rejection reason.
+def start_waiter(cost_class: CostClass, results: list) -> threading.Thread:
+    def run():
+        try:
+            cost_class.acquire()
+            results.append("admitted")
+        except AdmissionRejected as e:
+            results.append(e.reason)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+# -----------------------------
+# Admission Control
+# -----------------------------
+
+def test_admits_immediately_when_slot_is_free():
+    cost_class = CostClass("test", max_concurrency=1, max_queue_depth=1, queue_timeout=1.0)
+
+    cost_class.acquire()
+
+    stats = cost_class.stats()
+    assert stats["in_flight"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["admitted"] == 1
+
+def test_rejects_when_queue_is_full():
+    cost_class = CostClass("test", max_concurrency=1, max_queue_depth=1, queue_timeout=5.0)
+    cost_class.acquire()
+    results = []
+    waiter = start_waiter(cost_class, results)
+    wait_for_queue_depth(cost_class, 1)
+
+    with pytest.raises(AdmissionRejected) as e:
+        cost_class.acquire()
+    assert e.value.reason == "queue full"
+    assert cost_class.stats()["rejected_queue_full"] == 1
+
+    cost_class.release()
+    waiter.join()
+    assert results == ["admitted"]
+
+def test_rejects_when_queue_deadline_passes():
+    cost_class = CostClass("test", max_concurrency=1, max_queue_depth=1, queue_timeout=0.05)
+    cost_class.acquire()
+
+    with pytest.raises(AdmissionRejected) as e:
+        cost_class.acquire()
+    assert e.value.reason == "queue deadline exceeded"
+
+    stats = cost_class.stats()
+    assert stats["rejected_deadline"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 1
+
+def test_queued_request_is_admitted_after_release():
+    cost_class = CostClass("test", max_concurrency=1, max_queue_depth=1, queue_timeout=5.0)
+    cost_class.acquire()
+    results = []
+    waiter = start_waiter(cost_class, results)
+    wait_for_queue_depth(cost_class, 1)
+
+    cost_class.release()
+    waiter.join()
+
+    stats = cost_class.stats()
+    assert results == ["admitted"]
+    assert stats["in_flight"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["admitted"] == 2
+
+def test_controller_releases_slot_on_exit():
+    controller = AdmissionController(
+        cheap=CostClass(CHEAP, max_concurrency=1, max_queue_depth=0, queue_timeout=0.1),
+        expensive=CostClass(EXPENSIVE, max_concurrency=1, max_queue_depth=0, queue_timeout=0.1),
+    )
+
+    with controller.admit(EXPENSIVE):
+        # A full expensive class does not block cheap requests.
+        with controller.admit(CHEAP):
+            pass
+
+    stats = controller.stats()
+    assert stats[CHEAP]["in_flight"] == 0
+    assert stats[EXPENSIVE]["in_flight"] == 0
+
+# -----------------------------
+# Cost Classification
+# -----------------------------
+
+@pytest.mark.parametrize("operation, algorithm, key_size, payload_length, expected", [
+    ("decrypt", "RSA", 2048, 344, EXPENSIVE),
+    ("generate-key", "RSA", 2048, 0, EXPENSIVE),
+    ("generate-key", "RSA", 4096, 0, EXPENSIVE),
+    ("encrypt", "RSA", 2048, 100, CHEAP),
+    ("encrypt", "RSA", 4096, 100, CHEAP),
+    ("generate-key", "AES", 256, 0, CHEAP),
+    ("encrypt", "AES", 256, 100, CHEAP),
+    ("decrypt", "AES", 256, 100, CHEAP),
+])
+def test_classify_request(operation, algorithm, key_size, payload_length, expected):
+    assert classify_request(operation, algorithm, key_size, payload_length) == expected